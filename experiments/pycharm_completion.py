@@ -23,6 +23,3 @@ class Child(Parent):
 # Child().class_method()  # No hinting
 # Child().instance_method().foo()  # Ok
 # Child().instance_method().bad()  # Invalid
-
-
-import pdb; pdb.set_trace()
@@ -1,13 +1,22 @@
+from operator import attrgetter
+from sys import intern
 from typing import Dict
 
 from lightbus.exceptions import UnknownApi, InvalidApiRegistryEntry, EventNotFound, MisconfiguredApiOptions
 
 __all__ = ['Api', 'Event']
 
+# Dotted attribute access in C rather than two LOAD_ATTRs per API
+_is_internal = attrgetter('meta.internal')
+
 
 class Registry(object):
     def __init__(self):
         self._apis: Dict[str, Api] = dict()
+        # Pre-bound to save an attribute load per get(), which runs per-dispatch
+        self._get = self._apis.__getitem__
+        self._public_cache = None
+        self._internal_cache = None
 
     def add(self, api: 'Api'):
         if isinstance(api, type):
@@ -17,27 +26,60 @@ class Registry(object):
                 "than an instance of the API class."
             )
 
-        self._apis[api.meta.name] = api
+        # Interned keys match the interned api_name on incoming messages,
+        # making get() an identity comparison
+        self._apis[intern(api.meta.name)] = api
+        # The registry is written to at startup and read per-dispatch
+        # thereafter, so public()/internal() are cached until the next add()
+        self._public_cache = None
+        self._internal_cache = None
+
+    def add_lazy(self, api_class: type):
+        """Register an API class to be instantiated upon first use
+
+        This avoids running Api.__init__ side effects (e.g. for APIs using
+        custom construction) at class-definition time.
+        """
+        self._apis[intern(api_class.meta.name)] = api_class
+        self._public_cache = None
+        self._internal_cache = None
 
     def get(self, name) -> 'Api':
         try:
-            return self._apis[name]
+            api = self._get(name)
         except KeyError:
             raise UnknownApi(
                 "An API named '{}' was requested from the registry but the "
                 "registry does not recognise it. Maybe the incorrect API name "
                 "was specified, or maybe the API has not been registered.".format(name)
             )
+        if isinstance(api, type):
+            # Lazily registered via add_lazy(), instantiate on first use
+            api = self._apis[name] = api()
+        return api
 
     def public(self):
-        return [api for api in self._apis.values() if not api.meta.internal]
+        if self._public_cache is None:
+            self._materialize()
+            self._public_cache = [api for api in self._apis.values() if not _is_internal(api)]
+        return self._public_cache
 
     def internal(self):
-        return [api for api in self._apis.values() if api.meta.internal]
+        if self._internal_cache is None:
+            self._materialize()
+            self._internal_cache = [api for api in self._apis.values() if _is_internal(api)]
+        return self._internal_cache
 
     def all(self):
+        self._materialize()
         return self._apis.values()
 
+    def _materialize(self):
+        """Instantiate any lazily-registered API classes"""
+        for name, api in self._apis.items():
+            if isinstance(api, type):
+                self._apis[name] = api()
+
 
 registry = Registry()
 
@@ -48,9 +90,8 @@ class ApiOptions(object):
     auto_register: bool = True
 
     def __init__(self, options):
-        for k, v in options.items():
-            if not k.startswith('_'):
-                setattr(self, k, v)
+        # Write straight to __dict__ rather than using setattr() per key
+        self.__dict__.update({k: v for k, v in options.items() if not k.startswith('_')})
 
 
 class ApiMetaclass(type):
@@ -58,6 +99,7 @@ class ApiMetaclass(type):
     def __init__(cls, name, bases=None, dict=None):
         is_api_base_class = (name == 'Api' and bases == (object,))
         if is_api_base_class:
+            cls._events = {}
             super(ApiMetaclass, cls).__init__(name, bases, dict)
         else:
             options = dict.get('Meta', None)
@@ -69,15 +111,24 @@ class ApiMetaclass(type):
                     "the name used to access the API on the bus."
                     "".format(name)
                 )
-            cls.sanity_check_options(name, options)
-            cls.meta = ApiOptions(cls.Meta.__dict__.copy())
+            # Resolve the Meta options mapping once, rather than once for the
+            # sanity check and again for ApiOptions
+            meta_vars = vars(options)
+            cls.sanity_check_options(name, meta_vars)
+            cls.meta = ApiOptions(meta_vars)
+            # Cached on the class so __str__ needs a single attribute load
+            cls._name = cls.meta.name
+            # Collect the events declared on the class (merged with any
+            # inherited) so get_event() is a single dict lookup
+            cls._events = {**cls._events, **{k: v for k, v in dict.items() if isinstance(v, Event)}}
             super(ApiMetaclass, cls).__init__(name, bases, dict)
 
             if cls.meta.auto_register:
-                registry.add(cls())
+                # Lazy: instantiated on first use rather than at definition time
+                registry.add_lazy(cls)
 
-    def sanity_check_options(cls, name, options):
-        if not getattr(options, 'name', None):
+    def sanity_check_options(cls, name, meta_vars):
+        if not meta_vars.get('name', None):
             raise MisconfiguredApiOptions(
                 "API class {} does not specify a name option with its "
                 "'Meta' options."
@@ -95,14 +146,13 @@ class Api(object, metaclass=ApiMetaclass):
         return getattr(self, procedure_name)(**kwargs)
 
     def get_event(self, name) -> 'Event':
-        event = getattr(self, name, None)
-        if isinstance(event, Event):
-            return event
-        else:
+        try:
+            return self._events[name]
+        except KeyError:
             raise EventNotFound("Event named {}.{} could not be found".format(self, name))
 
     def __str__(self):
-        return self.meta.name
+        return self._name
 
 
 class Event(object):
@@ -1,8 +1,6 @@
-import traceback
+from sys import intern
 from typing import Optional, Dict, Any
-from uuid import uuid1
-
-from base64 import b64encode
+from secrets import token_urlsafe
 
 from lightbus.exceptions import InvalidRpcMessage
 
@@ -10,6 +8,7 @@ __all__ = ['Message']
 
 
 class Message(object):
+    __slots__ = ()
 
     def to_dict(self) -> dict:
         raise NotImplementedError()
@@ -20,50 +19,47 @@ class Message(object):
 
 
 class RpcMessage(Message):
+    __slots__ = ('rpc_id', 'api_name', 'procedure_name', 'kwargs', 'return_path', 'canonical_name')
 
     def __init__(self, *, api_name: str, procedure_name: str, kwargs: dict=Optional[None], return_path: Any=None, rpc_id: str=''):
-        self.rpc_id = rpc_id or b64encode(uuid1().bytes).decode('utf8')
-        self.api_name = api_name
-        self.procedure_name = procedure_name
+        self.rpc_id = rpc_id or token_urlsafe(12)
+        # Interned so downstream dict lookups (e.g. the API registry)
+        # fast-path to an identity comparison
+        self.api_name = intern(api_name)
+        self.procedure_name = intern(procedure_name)
         self.kwargs = kwargs
         self.return_path = return_path
+        # Precomputed as this gets accessed on every call
+        self.canonical_name = api_name + '.' + procedure_name
 
     def __repr__(self):
         return '<{}: {}>'.format(self.__class__.__name__, self)
 
     def __str__(self):
-        return '{}({})'.format(
-            self.canonical_name,
-            ', '.join('{}={}'.format(k, v) for k, v in self.kwargs.items())
-        )
-
-    @property
-    def canonical_name(self):
-        return "{}.{}".format(self.api_name, self.procedure_name)
+        # f-strings and a list (rather than a generator) keep join() fast here
+        kwargs = ', '.join([f'{k}={v}' for k, v in self.kwargs.items()])
+        return f'{self.canonical_name}({kwargs})'
 
     def to_dict(self) -> dict:
-        dictionary = {
+        return {
             'rpc_id': self.rpc_id,
             'api_name': self.api_name,
             'procedure_name': self.procedure_name,
             'return_path': self.return_path or '',
+            'kwargs': self.kwargs,
         }
-        dictionary.update(
-            **{'kw:{}'.format(k): v for k, v in self.kwargs.items()}
-        )
-        return dictionary
 
     @classmethod
     def from_dict(cls, dictionary: Dict[str, str]) -> 'RpcMessage':
         # TODO: Consider moving this encoding/decoding logic elsewhere
         # TODO: Handle non-string types for kwargs values (schema, encoding?)
         # TODO: Let's face it, this can all be neatened up quite a lot
-        for required_key in ('api_name', 'procedure_name', 'rpc_id'):
-            if required_key not in dictionary:
-                raise InvalidRpcMessage(
-                    "Required key {} missing in RpcMessage data. "
-                    "Found keys: {}".format(required_key, ', '.join(dictionary.keys()))
-                )
+        missing_keys = {'api_name', 'procedure_name', 'rpc_id'} - dictionary.keys()
+        if missing_keys:
+            raise InvalidRpcMessage(
+                "Required key(s) {} missing in RpcMessage data. "
+                "Found keys: {}".format(', '.join(sorted(missing_keys)), ', '.join(dictionary.keys()))
+            )
 
         rpc_id = dictionary.get('rpc_id')
         api_name = dictionary.get('api_name')
@@ -83,28 +79,50 @@ class RpcMessage(Message):
                 "Required key 'procedure_name' is present in {} data, but is empty.".format(cls.__name__)
             )
 
-        kwargs = {k[3:]: v for k, v in dictionary.items() if k.startswith('kw:')}
+        kwargs = dictionary.get('kwargs')
+        if kwargs is None:
+            # Fall back to the old flat encoding which prefixed each
+            # kwarg key with 'kw:'. Slicing the key is faster than
+            # startswith() for a short literal prefix.
+            kwargs = {}
+            for k, v in dictionary.items():
+                if k[:3] == 'kw:':
+                    kwargs[k[3:]] = v
 
         return cls(api_name=api_name, procedure_name=procedure_name,
                    return_path=return_path, kwargs=kwargs, rpc_id=rpc_id)
 
 
 class ResultMessage(Message):
+    __slots__ = ('rpc_id', 'result', 'error', 'trace')
 
     def __init__(self, *, result, rpc_id, error: bool=False, trace: str=None):
         self.rpc_id = rpc_id
-        
-        if isinstance(result, BaseException):
+
+        if error:
+            # Error flag set explicitly (i.e. a deserialised error result),
+            # so the fields are already formatted
+            self.result = result
+            self.error = True
+            self.trace = trace
+        elif isinstance(result, BaseException):
             self.result = str(result)
             self.error = True
-            self.trace = ''.join(traceback.format_exception(
-                etype=type(result),
-                value=result,
-                tb=result.__traceback__
-            ))
+            if result.__traceback__ is None:
+                # Nothing to format (the exception was never raised)
+                self.trace = repr(result)
+            else:
+                # Deferred import; only the error path needs it and it pulls
+                # in linecache at import time
+                import traceback
+                self.trace = ''.join(traceback.format_exception(
+                    type(result),
+                    result,
+                    result.__traceback__
+                ))
         else:
             self.result = result
-            self.error = error
+            self.error = False
             self.trace = trace
 
     def __repr__(self):
@@ -153,45 +171,40 @@ class ResultMessage(Message):
 
 
 class EventMessage(Message):
+    __slots__ = ('api_name', 'event_name', 'kwargs', 'canonical_name')
 
     def __init__(self, *, api_name: str, event_name: str, kwargs: dict=Optional[None]):
-        self.api_name = api_name
-        self.event_name = event_name
+        # Interned for the same reason as RpcMessage
+        self.api_name = intern(api_name)
+        self.event_name = intern(event_name)
         self.kwargs = kwargs or {}
+        # Precomputed as this gets accessed on every event
+        self.canonical_name = api_name + '.' + event_name
 
     def __repr__(self):
         return '<{}: {}>'.format(self.__class__.__name__, self)
 
     def __str__(self):
-        return '{}({})'.format(
-            self.canonical_name,
-            ', '.join('{}={}'.format(k, v) for k, v in self.kwargs.items())
-        )
-
-    @property
-    def canonical_name(self):
-        return "{}.{}".format(self.api_name, self.event_name)
+        kwargs = ', '.join([f'{k}={v}' for k, v in self.kwargs.items()])
+        return f'{self.canonical_name}({kwargs})'
 
     def to_dict(self) -> dict:
-        dictionary = {
+        return {
             'api_name': self.api_name,
             'event_name': self.event_name,
+            'kwargs': self.kwargs,
         }
-        dictionary.update(
-            **{'kw:{}'.format(k): v for k, v in self.kwargs.items()}
-        )
-        return dictionary
 
     @classmethod
     def from_dict(cls, dictionary: dict):
         # TODO: This has a lot in common with RpcMessage, consider refactoring
         #       *IF* it will reduce complexity.
-        for required_key in ('api_name', 'event_name'):
-            if required_key not in dictionary:
-                raise InvalidRpcMessage(
-                    "Required key {} missing in RpcMessage data. "
-                    "Found keys: {}".format(required_key, ', '.join(dictionary.keys()))
-                )
+        missing_keys = {'api_name', 'event_name'} - dictionary.keys()
+        if missing_keys:
+            raise InvalidRpcMessage(
+                "Required key(s) {} missing in EventMessage data. "
+                "Found keys: {}".format(', '.join(sorted(missing_keys)), ', '.join(dictionary.keys()))
+            )
 
         api_name = dictionary.get('api_name')
         event_name = dictionary.get('event_name')
@@ -205,6 +218,13 @@ class EventMessage(Message):
                 "Required key 'event_name' is present in {} data, but is empty.".format(cls.__name__)
             )
 
-        kwargs = {k[3:]: v for k, v in dictionary.items() if k.startswith('kw:')}
+        kwargs = dictionary.get('kwargs')
+        if kwargs is None:
+            # Fall back to the old flat 'kw:'-prefixed encoding,
+            # as in RpcMessage.from_dict() above
+            kwargs = {}
+            for k, v in dictionary.items():
+                if k[:3] == 'kw:':
+                    kwargs[k[3:]] = v
 
         return cls(api_name=api_name, event_name=event_name, kwargs=kwargs)
@@ -1,31 +1,38 @@
+from abc import ABC, abstractmethod
+from itertools import count
 from typing import Sequence, Tuple, Any, Hashable
-from uuid import uuid1
 
 from lightbus.api import Api
 from lightbus.message import RpcMessage, EventMessage, ResultMessage
 from lightbus.utilities import MessageConsumptionContext
 
+# Only uniqueness within this process is needed for the default
+# listener group keys, so a counter beats uuid1()'s clock read & lock
+_listener_group_counter = count()
 
-class RpcTransport(object):
+
+class RpcTransport(ABC):
     """Implement the sending and receiving of RPC calls"""
 
+    @abstractmethod
     async def call_rpc(self, rpc_message: RpcMessage, options: dict):
         """Publish a call to a remote procedure"""
-        raise NotImplementedError()
 
+    @abstractmethod
     async def consume_rpcs(self, apis: Sequence[Api]) -> Sequence[RpcMessage]:
         """Consume RPC calls for the given API"""
-        raise NotImplementedError()
 
 
-class ResultTransport(object):
+class ResultTransport(ABC):
     """Implement the send & receiving of results
 
     """
 
+    @abstractmethod
     def get_return_path(self, rpc_message: RpcMessage) -> str:
-        raise NotImplementedError()
+        """Get the path to which the caller should expect the result"""
 
+    @abstractmethod
     async def send_result(self, rpc_message: RpcMessage, result_message: ResultMessage, return_path: str):
         """Send a result back to the caller
 
@@ -35,8 +42,8 @@ class ResultTransport(object):
             return_path (str): The string indicating where to send the result.
                 As generated by :ref:`get_return_path()`.
         """
-        raise NotImplementedError()
 
+    @abstractmethod
     async def receive_result(self, rpc_message: RpcMessage, return_path: str, options: dict) -> ResultMessage:
         """Receive the result for the given message
 
@@ -46,10 +53,9 @@ class ResultTransport(object):
                 As generated by :ref:`get_return_path()`.
             options (dict): Dictionary of options specific to this particular backend
         """
-        raise NotImplementedError()
 
 
-class EventTransport(object):
+class EventTransport(ABC):
     """ Implement the sending/consumption of events over a given transport.
 
     The simplest implementation should simply be capable of:
@@ -73,16 +79,24 @@ class EventTransport(object):
 
     """
 
+    @abstractmethod
     async def send_event(self, event_message: EventMessage, options: dict):
         """Publish an event"""
-        raise NotImplementedError()
 
-    def consume_events(self):
-        return MessageConsumptionContext(
-            fetch=self.fetch_events,
-            on_consumed=self.consumption_complete,
-        )
+    # Built lazily as subclasses define their own __init__()s
+    _consume_ctx = None
 
+    def consume_events(self):
+        # Cache the context; it only wraps two bound methods and consume_events()
+        # gets called once per iteration of the consumption loop
+        if self._consume_ctx is None:
+            self._consume_ctx = MessageConsumptionContext(
+                fetch=self.fetch_events,
+                on_consumed=self.consumption_complete,
+            )
+        return self._consume_ctx
+
+    @abstractmethod
     async def fetch_events(self) -> Tuple[Sequence[EventMessage], Any]:
         """Consume RPC events for the given API
 
@@ -95,7 +109,6 @@ class EventTransport(object):
         will simply be ignored.
 
         """
-        raise NotImplementedError()
 
     async def consumption_complete(self, extra):
         pass
@@ -146,9 +159,9 @@ class EventTransport(object):
         You should implement this method to return different values for listeners which cannot
         be grouped together, and to return the same values for listeners which can be grouped together.
 
-        The default implementation simply returns a random UUID in all cases, therefore
+        The default implementation simply returns a unique value in all cases, therefore
         no grouping will occur. This is the safest option, but also will not provide any
         of the performance benefits detailed above.
 
         """
-        return uuid1()
+        return next(_listener_group_counter)
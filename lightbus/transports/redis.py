@@ -64,7 +64,7 @@ class RedisRpcTransport(RedisTransportMixin, RpcTransport):
         self.track_consumption_progress = track_consumption_progress  # TODO: Implement (rename: replay?)
 
     async def call_rpc(self, rpc_message: RpcMessage, options: dict):
-        stream = '{}:stream'.format(rpc_message.api_name)
+        stream = rpc_message.api_name + ':stream'
         logger.debug(
             LBullets(
                 L("Enqueuing message {} in Redis stream {}", Bold(rpc_message), Bold(stream)),
@@ -85,7 +85,7 @@ class RedisRpcTransport(RedisTransportMixin, RpcTransport):
 
     async def consume_rpcs(self, apis: Sequence[Api]) -> Sequence[RpcMessage]:
         # Get the name of each stream
-        streams = ['{}:stream'.format(api.meta.name) for api in apis]
+        streams = [api.meta.name + ':stream' for api in apis]
         # Get where we last left off in each stream
         latest_ids = [self._latest_ids.get(stream, '$') for stream in streams]
 
@@ -126,11 +126,7 @@ class RedisResultTransport(RedisTransportMixin, ResultTransport):
         self.connection_kwargs = connection_kwargs or dict(address=('localhost', 6379))
 
     def get_return_path(self, rpc_message: RpcMessage) -> str:
-        return 'redis+key://{}.{}:result:{}'.format(
-            rpc_message.api_name,
-            rpc_message.procedure_name,
-            rpc_message.rpc_id,
-        )
+        return 'redis+key://' + rpc_message.canonical_name + ':result:' + rpc_message.rpc_id
 
     async def send_result(self, rpc_message: RpcMessage, result_message: ResultMessage, return_path: str):
         logger.debug(L(
@@ -189,7 +185,7 @@ class RedisEventTransport(RedisTransportMixin, EventTransport):
 
     async def send_event(self, event_message: EventMessage, options: dict):
         """Publish an event"""
-        stream = '{}.{}:stream'.format(event_message.api_name, event_message.event_name)
+        stream = event_message.canonical_name + ':stream'
         logger.debug(
             LBullets(
                 L("Enqueuing event message {} in Redis stream {}", Bold(event_message), Bold(stream)),
@@ -594,8 +594,10 @@ def pytest_runtest_setup(item):
     # Clear out any plugins
     remove_all_plugins()
 
-    # Clear out the API registry
-    registry._apis = dict()
+    # Clear out the API registry (in place; the registry pre-binds to its dict)
+    registry._apis.clear()
+    registry._public_cache = None
+    registry._internal_cache = None
 
     if 'run_loop' in item.keywords and 'loop' not in item.fixturenames:
         # inject an event loop fixture for all async tests
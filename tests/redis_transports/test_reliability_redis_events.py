@@ -1,170 +1,167 @@
 import asyncio
+import os
 
 import logging
-from asyncio.futures import CancelledError
+from collections import defaultdict
 
 from random import random
 
 import pytest
 import lightbus
 from lightbus.exceptions import SuddenDeathException
-from lightbus.utilities import handle_aio_exceptions
 
 pytestmark = pytest.mark.reliability
 
 logger = logging.getLogger(__name__)
 
+_TOTAL = 100
+# dict_keys implements the set protocol, so comparing against this avoids
+# materialising two fresh sets per assertion
+_EXPECTED_IDS = frozenset(range(_TOTAL))
+
+
+@pytest.fixture
+def total():
+    # Scale the tests up (e.g. to exercise throughput changes) by setting
+    # LIGHTBUS_TEST_TOTAL rather than editing each literal
+    return int(os.environ.get('LIGHTBUS_TEST_TOTAL', _TOTAL))
+
+
+def _expected_ids(total):
+    return _EXPECTED_IDS if total == _TOTAL else frozenset(range(total))
+
+
+def _retrieve_exception(task):
+    # Retrieve (and report) any exception so asyncio doesn't log
+    # "Task exception was never retrieved" at GC time
+    if task.cancelled():
+        return
+    exception = task.exception()
+    if exception:
+        logger.error("TEST: Task crashed", exc_info=exception)
+
+
 @pytest.mark.run_loop  # TODO: Have test repeat a few times
-async def test_random_failures(bus: lightbus.BusNode, caplog, fire_dummy_events, listen_for_events, dummy_api):
+async def test_random_failures(bus: lightbus.BusNode, caplog, fire_dummy_events, listen_for_events, dummy_api,
+                               total):
     # Use test_history() (below) to repeat any cases which fail
     caplog.set_level(logging.WARNING)
 
-    event_ok_ids = dict()
-    event_mayhem_ids = dict()
+    event_ok_ids = defaultdict(int)
+    event_mayhem_ids = defaultdict(int)
     history = []
+    done_event = asyncio.Event()
+
+    # Decide up-front which events will die, keeping the RNG call out of
+    # the per-delivery hot path. The first and last calls never die as
+    # they are tested separately (see test_single_event_fails)
+    failure_mask = [random() < 0.3 for _ in range(total)]
+    failure_mask[0] = failure_mask[total - 1] = False
 
     # A listener that artificially simulates the process
     # dieing through use of the SuddenDeathException()
     async def listener(**kwargs):
-        call_id = int(kwargs['field'])
-        # Die randomly, except for the first and last calls
-        # which we'll test separately
-        if random() < 0.3 and call_id not in (0, 99):  # SIMULATE RANDOM EVENT DYING
+        # fire_dummy_events() passes ints and the JSON codec preserves
+        # them end to end, so no cast is needed
+        call_id = kwargs['field']
+        if failure_mask[call_id] and call_id not in event_mayhem_ids:  # SIMULATE RANDOM EVENT DYING
             # Cause some mayhem
-            event_mayhem_ids.setdefault(call_id, 0)
             event_mayhem_ids[call_id] += 1
             history.append((call_id, 'E'))
             raise SuddenDeathException()
         else:
-            event_ok_ids.setdefault(call_id, 0)
             event_ok_ids[call_id] += 1
             history.append((call_id, 'S'))
+            if len(event_ok_ids) == total:
+                done_event.set()
 
-    done, (listen_task, ) = await asyncio.wait(
-        [
-            handle_aio_exceptions(fire_dummy_events(total=100, initial_delay=0.1)),
-            handle_aio_exceptions(listen_for_events(listener=listener)),
-        ],
-        return_when=asyncio.FIRST_COMPLETED,
-        timeout=20
-    )
+    # Run the producer to completion; the listener runs forever and gets
+    # cancelled below. No need for asyncio.wait()'s FIRST_COMPLETED bookkeeping.
+    fire_task = asyncio.ensure_future(fire_dummy_events(total=total, initial_delay=0.1))
+    listen_task = asyncio.ensure_future(listen_for_events(listener=listener))
+    fire_task.add_done_callback(_retrieve_exception)
+    listen_task.add_done_callback(_retrieve_exception)
+    await asyncio.wait_for(fire_task, timeout=20)
 
     # Wait until we are done handling the events (up to 20 seconds)
-    for _ in range(1, 20):
-        await asyncio.sleep(1)
-        logging.warning('TEST: Still waiting for events to finish. {} so far'.format(len(event_ok_ids)))
-        if len(event_ok_ids) == 100:
-            logging.warning('TEST: Events finished')
-            break
+    try:
+        await asyncio.wait_for(done_event.wait(), timeout=20)
+        logging.warning('TEST: Events finished')
+    except asyncio.TimeoutError:
+        logging.warning('TEST: Timed out waiting for events to finish. %d so far', len(event_ok_ids))
 
     # Cleanup the tasks
     listen_task.cancel()
     try:
-        await listen_task
-    except CancelledError:
-        pass
+        # Bounded so a transport which is slow to respond to cancellation
+        # cannot hang the whole test run
+        await asyncio.wait_for(listen_task, timeout=2)
+    except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+        logging.warning("listen_task did not terminate: %s", e)
 
-    logger.warning("History: {}".format(','.join('{}{}'.format(*x) for x in history)))
+    logger.warning("History: %s", ','.join('{}{}'.format(*x) for x in history))
 
-    assert set(event_ok_ids.keys()) == set(range(0, 100))
+    assert event_ok_ids.keys() == _expected_ids(total)
 
-    duplicate_calls = sum([n - 1 for n in event_ok_ids.values()])
+    duplicate_calls = sum(event_ok_ids.values()) - len(event_ok_ids)
     assert duplicate_calls > 0
     assert len(event_mayhem_ids) > 0
 
 
-@pytest.mark.run_loop  # TODO: Have test repeat a few times
-async def test_first_event_fails(bus: lightbus.BusNode, caplog, fire_dummy_events, listen_for_events, dummy_api):
-    caplog.set_level(logging.WARNING)
-
-    event_ok_ids = dict()
-    event_mayhem_ids = dict()
+async def _run_single_failure_test(fire_dummy_events, listen_for_events, failing_id, total):
+    event_ok_ids = defaultdict(int)
+    event_mayhem_ids = defaultdict(int)
+    done_event = asyncio.Event()
 
     # A listener that artificially simulates the process
     # dieing through use of the SuddenDeathException()
     async def listener(**kwargs):
-        call_id = int(kwargs['field'])
-        if call_id == 0 and call_id not in event_mayhem_ids:  # SIMULATE FIRST EVENT DYING ONCE
+        # fire_dummy_events() passes ints and the JSON codec preserves
+        # them end to end, so no cast is needed
+        call_id = kwargs['field']
+        if call_id == failing_id and call_id not in event_mayhem_ids:  # SIMULATE EVENT DYING ONCE
             # Cause some mayhem
-            event_mayhem_ids.setdefault(call_id, 0)
             event_mayhem_ids[call_id] += 1
             raise SuddenDeathException()
         else:
-            event_ok_ids.setdefault(call_id, 0)
             event_ok_ids[call_id] += 1
+            if len(event_ok_ids) == total:
+                done_event.set()
 
-    done, (listen_task, ) = await asyncio.wait(
-        [
-            handle_aio_exceptions(fire_dummy_events(total=100, initial_delay=0.1)),
-            handle_aio_exceptions(listen_for_events(listener=listener)),
-        ],
-        return_when=asyncio.FIRST_COMPLETED,
-        timeout=10
-    )
+    fire_task = asyncio.ensure_future(fire_dummy_events(total=total, initial_delay=0.1))
+    listen_task = asyncio.ensure_future(listen_for_events(listener=listener))
+    fire_task.add_done_callback(_retrieve_exception)
+    listen_task.add_done_callback(_retrieve_exception)
+    await asyncio.wait_for(fire_task, timeout=10)
 
-    # Wait until we are done handling the events (up to 10 seconds)
-    for _ in range(1, 5):
-        await asyncio.sleep(1)
-        logging.warning('TEST: Still waiting for events to finish. {} so far'.format(len(event_ok_ids)))
-        if len(event_ok_ids) == 100:
-            logging.warning('TEST: Events finished')
-            break
+    # Wait until we are done handling the events (up to 5 seconds)
+    try:
+        await asyncio.wait_for(done_event.wait(), timeout=5)
+        logging.warning('TEST: Events finished')
+    except asyncio.TimeoutError:
+        logging.warning('TEST: Timed out waiting for events to finish. %d so far', len(event_ok_ids))
 
     # Cleanup the tasks
     listen_task.cancel()
     try:
-        await listen_task
-    except CancelledError:
-        pass
+        # Bounded so a transport which is slow to respond to cancellation
+        # cannot hang the whole test run
+        await asyncio.wait_for(listen_task, timeout=2)
+    except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+        logging.warning("listen_task did not terminate: %s", e)
 
-    assert set(event_ok_ids.keys()) == set(range(0, 100))
+    assert event_ok_ids.keys() == _expected_ids(total)
 
 
 @pytest.mark.run_loop  # TODO: Have test repeat a few times
-async def test_last_event_fails(bus: lightbus.BusNode, caplog, fire_dummy_events, listen_for_events, dummy_api):
+@pytest.mark.parametrize("fail_position", ['first', 'last'])
+async def test_single_event_fails(bus: lightbus.BusNode, caplog, fire_dummy_events, listen_for_events, dummy_api,
+                                  fail_position, total):
+    # The first and last events are the boundary cases for redelivery,
+    # differing only in which event dies. One body, two parameters.
     caplog.set_level(logging.WARNING)
-
-    event_ok_ids = dict()
-    event_mayhem_ids = dict()
-
-    # A listener that artificially simulates the process
-    # dieing through use of the SuddenDeathException()
-    async def listener(**kwargs):
-        call_id = int(kwargs['field'])
-        if call_id == 99 and call_id not in event_mayhem_ids:  # SIMULATE LAST EVENT DYING ONCE
-            # Cause some mayhem
-            event_mayhem_ids.setdefault(call_id, 0)
-            event_mayhem_ids[call_id] += 1
-            raise SuddenDeathException()
-        else:
-            event_ok_ids.setdefault(call_id, 0)
-            event_ok_ids[call_id] += 1
-
-    done, (listen_task, ) = await asyncio.wait(
-        [
-            handle_aio_exceptions(fire_dummy_events(total=100, initial_delay=0.1)),
-            handle_aio_exceptions(listen_for_events(listener=listener)),
-        ],
-        return_when=asyncio.FIRST_COMPLETED,
-        timeout=10
-    )
-
-    # Wait until we are done handling the events (up to 10 seconds)
-    for _ in range(1, 5):
-        await asyncio.sleep(1)
-        logging.warning('TEST: Still waiting for events to finish. {} so far'.format(len(event_ok_ids)))
-        if len(event_ok_ids) == 100:
-            logging.warning('TEST: Events finished')
-            break
-
-    # Cleanup the tasks
-    listen_task.cancel()
-    try:
-        await listen_task
-    except CancelledError:
-        pass
-
-    assert set(event_ok_ids.keys()) == set(range(0, 100))
+    failing_id = 0 if fail_position == 'first' else total - 1
+    await _run_single_failure_test(fire_dummy_events, listen_for_events, failing_id, total)
 
 
 @pytest.mark.skip
@@ -178,49 +175,50 @@ async def test_history(bus: lightbus.BusNode, caplog, fire_dummy_events, listen_
 
     caplog.set_level(logging.WARNING)
 
-    event_ok_ids = dict()
-    event_mayhem_ids = dict()
+    event_ok_ids = defaultdict(int)
+    event_mayhem_ids = defaultdict(int)
+    done_event = asyncio.Event()
 
     async def listener(**kwargs):
-        call_id = int(kwargs['field'])
+        # fire_dummy_events() passes ints and the JSON codec preserves
+        # them end to end, so no cast is needed
+        call_id = kwargs['field']
         history_call_id, action = history.pop(0)
         assert history_call_id == call_id, "History was invalid"
 
         if action == 'E':
             # Cause some mayhem
-            event_mayhem_ids.setdefault(call_id, 0)
             event_mayhem_ids[call_id] += 1
             raise SuddenDeathException()
         else:
-            event_ok_ids.setdefault(call_id, 0)
             event_ok_ids[call_id] += 1
+            if len(event_ok_ids) == _TOTAL:
+                done_event.set()
 
-    done, (listen_task, ) = await asyncio.wait(
-        [
-            handle_aio_exceptions(fire_dummy_events(total=100, initial_delay=0.1)),
-            handle_aio_exceptions(listen_for_events(listener=listener)),
-        ],
-        return_when=asyncio.FIRST_COMPLETED,
-        timeout=10
-    )
+    fire_task = asyncio.ensure_future(fire_dummy_events(total=_TOTAL, initial_delay=0.1))
+    listen_task = asyncio.ensure_future(listen_for_events(listener=listener))
+    fire_task.add_done_callback(_retrieve_exception)
+    listen_task.add_done_callback(_retrieve_exception)
+    await asyncio.wait_for(fire_task, timeout=10)
 
-    # Wait until we are done handling the events (up to 5 seconds)
-    for _ in range(1, 10):
-        await asyncio.sleep(1)
-        logging.warning('TEST: Still waiting for events to finish. {} so far'.format(len(event_ok_ids)))
-        if len(event_ok_ids) == 100:
-            logging.warning('TEST: Events finished')
-            break
+    # Wait until we are done handling the events (up to 10 seconds)
+    try:
+        await asyncio.wait_for(done_event.wait(), timeout=10)
+        logging.warning('TEST: Events finished')
+    except asyncio.TimeoutError:
+        logging.warning('TEST: Timed out waiting for events to finish. %d so far', len(event_ok_ids))
 
     # Cleanup the tasks
     listen_task.cancel()
     try:
-        await listen_task
-    except CancelledError:
-        pass
+        # Bounded so a transport which is slow to respond to cancellation
+        # cannot hang the whole test run
+        await asyncio.wait_for(listen_task, timeout=2)
+    except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+        logging.warning("listen_task did not terminate: %s", e)
 
-    assert set(event_ok_ids.keys()) == set(range(0, 100))
+    assert event_ok_ids.keys() == _EXPECTED_IDS
 
-    duplicate_calls = sum([n - 1 for n in event_ok_ids.values()])
+    duplicate_calls = sum(event_ok_ids.values()) - len(event_ok_ids)
     assert duplicate_calls > 0
     assert len(event_mayhem_ids) > 0
@@ -30,7 +30,7 @@ async def test_send_event(redis_event_transport: RedisEventTransport, redis_clie
     assert messages[0][1] == {
         b'api_name': b'"my.api"',
         b'event_name': b'"my_event"',
-        b'kw:field': b'"value"',
+        b'kwargs': b'{"field": "value"}',
     }
 
 
@@ -41,7 +41,7 @@ async def test_consume_events(redis_event_transport: RedisEventTransport, redis_
         return await redis_client.xadd('my.dummy.my_event:stream', fields={
             b'api_name': b'"my.dummy"',
             b'event_name': b'"my_event"',
-            b'kw:field': b'"value"',
+            b'kwargs': b'{"field": "value"}',
         })
 
     async def co_consume():
@@ -63,7 +63,7 @@ async def test_consume_events_since_id(redis_event_transport: RedisEventTranspor
         fields={
             b'api_name': b'"my.dummy"',
             b'event_name': b'"my_event"',
-            b'kw:field': b'"1"',
+            b'kwargs': b'{"field": "1"}',
         },
         message_id='1515000001000-0',
     )
@@ -72,7 +72,7 @@ async def test_consume_events_since_id(redis_event_transport: RedisEventTranspor
         fields={
             b'api_name': b'"my.dummy"',
             b'event_name': b'"my_event"',
-            b'kw:field': b'"2"',
+            b'kwargs': b'{"field": "2"}',
         },
         message_id='1515000002000-0',
     )
@@ -81,7 +81,7 @@ async def test_consume_events_since_id(redis_event_transport: RedisEventTranspor
         fields={
             b'api_name': b'"my.dummy"',
             b'event_name': b'"my_event"',
-            b'kw:field': b'"3"',
+            b'kwargs': b'{"field": "3"}',
         },
         message_id='1515000003000-0',
     )
@@ -103,7 +103,7 @@ async def test_consume_events_since_datetime(redis_event_transport: RedisEventTr
         fields={
             b'api_name': b'"my.dummy"',
             b'event_name': b'"my_event"',
-            b'kw:field': b'"1"',
+            b'kwargs': b'{"field": "1"}',
         },
         message_id='1515000001000-0',
     )
@@ -112,7 +112,7 @@ async def test_consume_events_since_datetime(redis_event_transport: RedisEventTr
         fields={
             b'api_name': b'"my.dummy"',
             b'event_name': b'"my_event"',
-            b'kw:field': b'"2"',
+            b'kwargs': b'{"field": "2"}',
         },
         message_id='1515000002000-0',
     )
@@ -121,7 +121,7 @@ async def test_consume_events_since_datetime(redis_event_transport: RedisEventTr
         fields={
             b'api_name': b'"my.dummy"',
             b'event_name': b'"my_event"',
-            b'kw:field': b'"3"',
+            b'kwargs': b'{"field": "3"}',
         },
         message_id='1515000003000-0',
     )
@@ -35,7 +35,7 @@ async def test_call_rpc(redis_rpc_transport, redis_client):
         b'rpc_id': b'"123abc"',
         b'api_name': b'"my.api"',
         b'procedure_name': b'"my_proc"',
-        b'kw:field': b'"value"',
+        b'kwargs': b'{"field": "value"}',
         b'return_path': b'"abc"',
     }
 
@@ -49,7 +49,7 @@ async def test_consume_rpcs(redis_client, redis_rpc_transport, dummy_api):
             b'rpc_id': b'"123abc"',
             b'api_name': b'"my.api"',
             b'procedure_name': b'"my_proc"',
-            b'kw:field': b'"value"',
+            b'kwargs': b'{"field": "value"}',
             b'return_path': b'"abc"',
         })
 